@@ -408,16 +408,16 @@ public:
 		                     count)));
 	}
 
-	python_write_result write_prepare(const bp::api::object &id, const std::string &data, uint64_t remote_offset, uint64_t psize) {
-		return create_result(std::move(session::write_prepare(transform(id).id(), data_pointer::copy(data), remote_offset, psize)));
+	python_write_result write_prepare(const bp::api::object &id, const bp::api::object &data, uint64_t remote_offset, uint64_t psize) {
+		return create_result(std::move(session::write_prepare(transform(id).id(), copy_data(data), remote_offset, psize)));
 	}
 
-	python_write_result write_plain(const bp::api::object &id, const std::string &data, uint64_t remote_offset) {
-		return create_result(std::move(session::write_plain(transform(id).id(), data_pointer::copy(data), remote_offset)));
+	python_write_result write_plain(const bp::api::object &id, const bp::api::object &data, uint64_t remote_offset) {
+		return create_result(std::move(session::write_plain(transform(id).id(), copy_data(data), remote_offset)));
 	}
 
-	python_write_result write_commit(const bp::api::object &id, const std::string &data, uint64_t remote_offset, uint64_t csize) {
-		return create_result(std::move(session::write_commit(transform(id).id(), data_pointer::copy(data), remote_offset, csize)));
+	python_write_result write_commit(const bp::api::object &id, const bp::api::object &data, uint64_t remote_offset, uint64_t csize) {
+		return create_result(std::move(session::write_commit(transform(id).id(), copy_data(data), remote_offset, csize)));
 	}
 
 	python_write_result write_cache(const bp::api::object &id, const std::string &data, long timeout) {
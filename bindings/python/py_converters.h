@@ -43,6 +43,28 @@ std::vector<data_pointer> convert_to_vector<data_pointer>(const bp::api::object
 	return ret;
 }
 
+/*
+ * Copies content of python string @data directly into data_pointer
+ * without making intermediate std::string
+ */
+static inline data_pointer copy_data(const bp::api::object &data)
+{
+	char *buffer;
+	Py_ssize_t size;
+	if (PyString_AsStringAndSize(data.ptr(), &buffer, &size) == -1)
+		bp::throw_error_already_set();
+	return data_pointer::copy(buffer, size);
+}
+
+/*
+ * Makes python string from @data without making intermediate std::string
+ */
+static inline bp::object data_to_string(const data_pointer &data)
+{
+	return bp::object(bp::handle<>(PyString_FromStringAndSize(reinterpret_cast<const char *>(data.data()),
+	                                                          data.size())));
+}
+
 template <typename T>
 static bp::list convert_to_list(const std::vector<T> &vect)
 {
@@ -68,9 +68,9 @@ static elliptics_time iterator_response_get_timestamp(dnet_iterator_response *re
 	return elliptics_time(response->timestamp);
 }
 
-std::string read_result_get_data(read_result_entry &result)
+bp::object read_result_get_data(read_result_entry &result)
 {
-	return result.file().to_string();
+	return data_to_string(result.file());
 }
 
 elliptics_id read_result_get_id(read_result_entry &result)
@@ -13,15 +13,17 @@
 # GNU General Public License for more details.
 # =============================================================================
 
+from binascii import unhexlify
 from elliptics.core import Id
 from elliptics.log import logged_class
 
 
 def convert_to_list(key):
-    id = []
-    while key > 0:
-        id = [key % 256] + id
-        key /= 256
+    if key <= 0:
+        return [0] * 64
+    # converts whole number via its hex representation instead of dividing it byte by byte
+    hex_key = '%x' % key
+    id = list(bytearray(unhexlify(hex_key.zfill(len(hex_key) + len(hex_key) % 2))))
     if len(id) < 64:
         id = [0] * (64 - len(id)) + id
     return id[:64]
@@ -32,11 +32,11 @@ log = logging.getLogger()
 
 
 class KeyRecover(object):
-    def __init__(self, ctx, key, key_infos, missed_groups, node, callback):
+    def __init__(self, ctx, key, key_infos, missed_groups, node, callback, stats=None):
         self.ctx = ctx
         self.complete = threading.Event()
         self.callback = callback
-        self.stats = RecoverStat()
+        self.stats = stats if stats is not None else RecoverStat()
         self.key = key
         self.key_flags = 0
         self.key_infos = key_infos
@@ -393,7 +393,7 @@ class WindowedDC(WindowedRecovery):
             with self.lock:
                 key = next(self.keys)
                 self.recovers_in_progress += 1
-            KeyRecover(self.ctx, *key, node=self.node, callback=self.callback)
+            KeyRecover(self.ctx, *key, node=self.node, callback=self.callback, stats=self.get_stat())
             return True
         except StopIteration:
             last = False
@@ -537,6 +537,7 @@ if __name__ == '__main__':
         raise ValueError("Can't parse batchsize: '{0}': {1}, traceback: {2}"
                          .format(options.batch_size, repr(e), traceback.format_exc()))
     log.info("Using batch_size: {0}".format(ctx.batch_size))
+    ctx.max_inflight = ctx.batch_size
 
     try:
         ctx.wait_timeout = int(options.wait_timeout)
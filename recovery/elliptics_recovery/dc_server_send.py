@@ -2,11 +2,10 @@ import logging
 import os
 import errno
 import time
-from itertools import groupby
 
 from sets import Set
 
-from elliptics_recovery.utils.misc import dump_key_data, load_key_data_from_file
+from elliptics_recovery.utils.misc import dump_key_data, load_key_data_from_file, chunks
 
 import elliptics
 
@@ -84,9 +83,8 @@ class BucketKeys(object):
         @max_keys_num defines max number of keys in the bunch.
         '''
         self.bucket_file.seek(0)
-        for _, batch in groupby(enumerate(load_key_data_from_file(self.bucket_file)),
-                                key=lambda x: x[0] / max_keys_num):
-            yield [item[1] for item in batch]
+        for batch in chunks(load_key_data_from_file(self.bucket_file), max_keys_num):
+            yield batch
 
     def get_group_id(self):
         return self.group_id
@@ -234,6 +234,18 @@ def main(options, args):
                          .format(options.batch_size, repr(e), traceback.format_exc()))
     log.info("Using batch_size: {0}".format(ctx.batch_size))
 
+    try:
+        if options.max_inflight is None:
+            ctx.max_inflight = ctx.batch_size
+        else:
+            ctx.max_inflight = int(options.max_inflight)
+        if ctx.max_inflight <= 0:
+            raise ValueError("Number of keys in flight should be positive: {0}".format(ctx.max_inflight))
+    except Exception as e:
+        raise ValueError("Can't parse max_inflight: '{0}': {1}, traceback: {2}"
+                         .format(options.max_inflight, repr(e), traceback.format_exc()))
+    log.info("Using max_inflight: {0}".format(ctx.max_inflight))
+
     try:
         ctx.nprocess = int(options.nprocess)
         if ctx.nprocess <= 0:
@@ -311,7 +323,7 @@ def main(options, args):
 
     try:
         log.info("Creating pool of processes: %d", ctx.nprocess)
-        ctx.pool = Pool(processes=ctx.nprocess, initializer=worker_init)
+        ctx.pool = Pool(processes=ctx.nprocess, initializer=worker_init, initargs=(ctx.portable(),))
         if recovery_type == TYPE_MERGE:
             if ctx.dump_file:
                 from elliptics_recovery.types.merge import dump_main
@@ -417,4 +429,7 @@ def run(args=None):
                       help='Do not use server-send for recovery. Disabling recovery via server-send useful if there is no network connection between groups')
     parser.add_option('--user-flags', action='append', dest='user_flags_set', default=[],
                       help='Recover key if at least one replica has user_flags from specified user_flags_set')
+    parser.add_option('--max-inflight', action='store', dest='max_inflight', default=None,
+                      help='Maximum number of keys which are recovered simultaneously by one process. '
+                      'Small values suit LAN, large values suit high-latency links [default: batch size]')
     return main(*parser.parse_args(args))
@@ -27,21 +27,64 @@ by placing them to the node where they belong.
 
 import logging
 import os
-from itertools import groupby
 import traceback
 import threading
 import errno
 from bisect import bisect
+from collections import defaultdict
 
 from ..etime import Time
-from ..utils.misc import elliptics_create_node, RecoverStat, LookupDirect, RemoveDirect, WindowedRecovery
-from ..route import RouteList
+from ..utils.misc import get_worker_node, RecoverStat, LookupDirect, RemoveDirect
+from ..utils.misc import WindowedRecovery, chunks, create_direct_session, attempt_timeout
 from ..iterator import MergeRecoveryIterator
 from ..range import IdRange
 import elliptics
 
 log = logging.getLogger(__name__)
 
+# reply to a chunk read carries struct dnet_cmd (120 bytes) and struct dnet_io_attr (208 bytes)
+# before the data (see include/elliptics/packet.h). Chunks are read smaller by their size,
+# so the received reply of a chunk fits in ctx.chunk_size bytes
+CHUNK_SIZE_RESERVE = 120 + 208
+
+
+def get_group_routes(ctx, group):
+    '''
+    Returns route list of @group. It is filtered from ctx.routes once per group and cached in @ctx
+    '''
+    try:
+        return ctx.group_routes[group]
+    except AttributeError:
+        ctx.group_routes = {}
+    except KeyError:
+        pass
+    routes = ctx.routes.filter_by_group(group)
+    ctx.group_routes[group] = routes
+    return routes
+
+
+def create_sessions(node, address, backend_id, group, ctx):
+    '''
+    Creates sessions used by Recovery: direct sessions for reading key from @address/@backend_id
+    with and without checksum verification, session for looking up the key on proper node of @group
+    and session for writing the key to it
+    '''
+    def create_read_session(ioflags):
+        direct_session = elliptics.Session(node)
+        direct_session.trace_id = ctx.trace_id
+        direct_session.set_direct_id(address, backend_id)
+        direct_session.groups = [group]
+        direct_session.ioflags = ioflags
+        return direct_session
+
+    session = elliptics.Session(node)
+    session.groups = [group]
+    session.trace_id = ctx.trace_id
+    return (create_read_session(0),
+            create_read_session(elliptics.io_flags.nocsum),
+            create_direct_session(node, group, ctx),
+            session)
+
 
 class Recovery(object):
     '''
@@ -49,107 +92,185 @@ class Recovery(object):
     with optional check that group doesn't have or have an older version of the key.
     If Recovery was inited with callback then this callback will be called when all work is done.
     '''
-    def __init__(self, key, timestamp, flags, size, address, backend_id, group, ctx, node, check=True, callback=None):
+    def __init__(self, key, timestamp, flags, size, address, backend_id, group, ctx, node, check=True, callback=None,
+                 dest_address=None, dest_backend_id=None, stats=None, sessions=None):
         self.key = key
         self.key_timestamp = timestamp
         self.key_flags = flags
         self.address = address
         self.backend_id = backend_id
+        self.dest_address = dest_address
+        self.dest_backend_id = dest_backend_id
         self.group = group
         self.node = node
-        self.direct_session = elliptics.Session(node)
-        self.direct_session.trace_id = ctx.trace_id
-        self.direct_session.set_direct_id(self.address, self.backend_id)
-        self.direct_session.groups = [group]
-        self.session = elliptics.Session(node)
-        self.session.groups = [group]
-        self.session.trace_id = ctx.trace_id
+        if sessions is None:
+            sessions = create_sessions(node, address, backend_id, group, ctx)
+        self.direct_session, self.nocsum_session, self.lookup_session, self.session = sessions
         self.ctx = ctx
-        self.stats = RecoverStat()
+        self.stats = stats if stats is not None else RecoverStat()
         self.result = True
         self.attempt = 0
+        self.read_attempt = 0
         self.total_size = size
         self.recovered_size = 0
+        # offset of the next chunk which should be read
+        self.read_offset = 0
+        # chunk which has been read while previous one is being written
+        self.read_data = None
+        self.writing = False
+        self.stopped = False
+        # number of the key's requests which are in flight. Sessions and stats are used by them,
+        # so the stopped recovery is reported only when all of them are completed
+        self.inflight = 0
         # if size of object more that size of one chunk than file should be read/written in chunks
-        self.chunked = self.total_size > self.ctx.chunk_size
+        self.chunked = self.total_size > ctx.chunk_size
+        # size of chunk read from the node, it is used only for chunked keys
+        self.chunk_size = ctx.chunk_size
+        if self.chunk_size > CHUNK_SIZE_RESERVE:
+            self.chunk_size -= CHUNK_SIZE_RESERVE
         self.check = check
         self.callback = callback
-        self.complete = threading.Event()
-        log.debug("Created Recovery object for key: {0}, node: {1}/{2}".format(repr(key), address, backend_id))
+        # event is created only if someone waits for the recovery, recovers run via callback don't need it
+        self.complete = None
+        self.finished = False
+        # protects state shared by the lookup, reads and writes which are run in parallel
+        self.lock = threading.Lock()
+        self.lookup_pending = False
+        self.drop_read = False
+        self.postponed_read = None
+        log.debug("Created Recovery object for key: %r, node: %s/%s", key, address, backend_id)
 
     def run(self):
-        log.info("Recovering key: {0}, node: {1}/{2}".format(repr(self.key), self.address, self.backend_id))
+        log.info("Recovering key: %r, node: %s/%s", self.key, self.address, self.backend_id)
         if self.key_flags & elliptics.record_flags.uncommitted:
-            log.info('Key: {0} is uncommitted. Remove it'.format(self.key))
-            self.remove()
+            log.info('Key: %s is uncommitted. Remove it', self.key)
             self.stats.skipped += 1
+            self.remove()
             return
-        address, _, backend_id = self.ctx.routes.filter_by_group(self.group).get_id_routes(self.key)[0]
-        if (address, backend_id) == (self.address, self.backend_id):
-            log.debug("Key: {0} already on the right node: {1}/{2}"
-                      .format(repr(self.key), self.address, self.backend_id))
+        if self.dest_address is None:
+            # destination wasn't provided by caller - determine it from the route table
+            self.dest_address, _, self.dest_backend_id = \
+                get_group_routes(self.ctx, self.group).get_id_routes(self.key)[0]
+        if (self.dest_address, self.dest_backend_id) == (self.address, self.backend_id):
+            log.debug("Key: %r already on the right node: %s/%s", self.key, self.address, self.backend_id)
             self.stats.skipped += 1
             self.stop(True)
             return
         else:
-            log.debug("Key: {0} should be on node: {1}/{2}"
-                      .format(repr(self.key), address, backend_id))
-        self.dest_address = address
-        self.dest_backend_id = backend_id
+            log.debug("Key: %r should be on node: %s/%s", self.key, self.dest_address, self.dest_backend_id)
         if self.check:
-            log.debug("Lookup key: {0} on node: {1}/{2}".format(repr(self.key),
-                                                                self.dest_address,
-                                                                self.dest_backend_id))
-            LookupDirect(self.dest_address,
-                         self.dest_backend_id,
-                         self.key,
-                         self.group,
-                         self.ctx,
-                         self.node,
-                         self.onlookup).run()
+            if not self.ctx.dry_run:
+                # reads the key in parallel with the lookup to save a round trip in the common case
+                # when the proper node misses the key or has older version of it.
+                # The read will be dropped if the proper node has newer version of the key.
+                self.lookup_pending = True
+                self.read_attempt = 0
+                self.read()
+                if self.stopped:
+                    return
+            log.debug("Lookup key: %r on node: %s/%s", self.key, self.dest_address, self.dest_backend_id)
+            if not self.start_op():
+                return
+            try:
+                LookupDirect(self.dest_address,
+                             self.dest_backend_id,
+                             self.key,
+                             self.group,
+                             self.ctx,
+                             self.node,
+                             self.onlookup,
+                             session=self.lookup_session).run()
+            except Exception as e:
+                log.error("Lookup key: {0} raised exception: {1}, traceback: {2}"
+                          .format(self.key, repr(e), traceback.format_exc()))
+                self.stop(False)
+                self.finish_op()
         elif self.ctx.dry_run:
             log.debug("Dry-run mode is turned on. Skipping reading, writing and removing stages.")
             self.stop(True)
             return
         else:
-            self.attempt = 0
+            self.read_attempt = 0
             self.read()
 
     def stop(self, result):
-        self.result = result
-        log.debug("Finished recovering key: {0} with result: {1}".format(self.key, self.result))
+        # read and write of the key run in parallel and both of them may fail,
+        # but recovery should be finished and reported only once
+        with self.lock:
+            if self.stopped:
+                return
+            self.stopped = True
+            self.result = result
+            if self.postponed_read:
+                # the read won't be handled by onlookup anymore
+                self.postponed_read = None
+                self.inflight -= 1
+            if self.inflight:
+                # the recovery will be finished by the last completed request
+                return
+        self.finish()
+
+    def start_op(self):
+        '''
+        Accounts new request of the key. Returns False if the recovery is stopped and the request shouldn't be sent
+        '''
+        with self.lock:
+            if self.stopped:
+                return False
+            self.inflight += 1
+            return True
+
+    def finish_op(self):
+        '''
+        Accounts completion of the key's request and finishes the stopped recovery after its last request
+        '''
+        with self.lock:
+            self.inflight -= 1
+            if self.inflight or not self.stopped:
+                return
+        self.finish()
+
+    def finish(self):
+        log.debug("Finished recovering key: %s with result: %s", self.key, self.result)
         if self.callback:
             self.callback(self.result, self.stats)
-        self.complete.set()
+        with self.lock:
+            self.finished = True
+            complete = self.complete
+        if complete:
+            complete.set()
 
     def read(self):
+        if not self.start_op():
+            return
         size = 0
         try:
-            log.debug("Reading key: {0} from node: {1}/{2}, chunked: {3}"
-                      .format(repr(self.key), self.address, self.backend_id, self.chunked))
+            log.debug("Reading key: %r from node: %s/%s, chunked: %s",
+                      self.key, self.address, self.backend_id, self.chunked)
             if self.chunked:
                 # size of chunk that should be read/written next
-                size = min(self.total_size - self.recovered_size, self.ctx.chunk_size)
-            if self.recovered_size != 0:
-                if self.key_flags & elliptics.record_flags.chunked_csum:
-                    # if record was checksummed by chunks there is no need to disable checksum verification
-                    self.direct_session.ioflags &= ~elliptics.io_flags.nocsum
-                else:
-                    # if it is not first chunk then do not check checksum on read
-                    self.direct_session.ioflags |= elliptics.io_flags.nocsum
-            self.direct_session.read_data(self.key,
-                                          offset=self.recovered_size,
-                                          size=size).connect(self.onread)
+                size = min(self.total_size - self.read_offset, self.chunk_size)
+            session = self.direct_session
+            if self.read_offset != 0 and not self.key_flags & elliptics.record_flags.chunked_csum:
+                # if it is not first chunk then do not check checksum on read,
+                # unless record was checksummed by chunks
+                session = self.nocsum_session
+            session.timeout = attempt_timeout(self.ctx, self.read_attempt)
+            session.read_data(self.key,
+                              offset=self.read_offset,
+                              size=size).connect(self.onread)
         except Exception, e:
             log.error("Read key: {0} by offset: {1} and size: {2} raised exception: {3}, traceback: {4}"
-                      .format(self.key, self.recovered_size, size, repr(e), traceback.format_exc()))
+                      .format(self.key, self.read_offset, size, repr(e), traceback.format_exc()))
             self.stop(False)
+            self.finish_op()
 
     def write(self):
+        if not self.start_op():
+            return
         try:
-            log.debug("Writing key: {0} to node: {1}/{2}".format(repr(self.key),
-                                                                 self.dest_address,
-                                                                 self.dest_backend_id))
+            log.debug("Writing key: %r to node: %s/%s", self.key, self.dest_address, self.dest_backend_id)
+            self.session.timeout = attempt_timeout(self.ctx, self.attempt)
             if self.chunked:
                 if self.recovered_size == 0:
                     # if it is first chunk - write it via prepare
@@ -177,65 +298,90 @@ class Recovery(object):
         except Exception, e:
             log.error("Write exception: {0}, traceback: {1}"
                       .format(repr(e), traceback.format_exc()))
-            self.Stop(False)
+            self.stop(False)
+            self.finish_op()
 
     def remove(self):
         if self.ctx.safe or self.ctx.dry_run:
             if self.ctx.safe:
-                log.info("Safe mode is turned on. Skip removing key: {0}".format(repr(self.key)))
+                log.info("Safe mode is turned on. Skip removing key: %r", self.key)
             else:
-                log.info("Dry-run mode is turned on. Skip removing key: {0}.".format(repr(self.key)))
+                log.info("Dry-run mode is turned on. Skip removing key: %r.", self.key)
             self.stop(True)
         else:
-            log.info("Removing key: {0} from node: {1}/{2}".format(repr(self.key), self.address, self.backend_id))
+            if not self.start_op():
+                return
+            log.info("Removing key: %r from node: %s/%s", self.key, self.address, self.backend_id)
             # remove object directly from address by using RemoveDirect
-            RemoveDirect(self.address,
-                         self.backend_id,
-                         self.key,
-                         self.group,
-                         self.ctx,
-                         self.node,
-                         self.onremove).run()
+            # via the read session which is already directed to the address
+            try:
+                RemoveDirect(self.address,
+                             self.backend_id,
+                             self.key,
+                             self.group,
+                             self.ctx,
+                             self.node,
+                             self.onremove,
+                             session=self.direct_session).run()
+            except Exception as e:
+                log.error("Remove key: {0} raised exception: {1}, traceback: {2}"
+                          .format(self.key, repr(e), traceback.format_exc()))
+                self.stop(False)
+                self.finish_op()
 
     def onlookup(self, result, stats):
         try:
             self.stats += stats
-            if result and self.key_timestamp < result.timestamp:
-                log.debug("Key: {0} on node: {1}/{2} is newer. Just removing it from node: {3}/{4}."
-                          .format(repr(self.key), self.dest_address, self.dest_backend_id,
-                                  self.address, self.backend_id))
+            newer = bool(result) and self.key_timestamp < result.timestamp
+            with self.lock:
+                self.lookup_pending = False
+                self.drop_read = newer
+                postponed_read, self.postponed_read = self.postponed_read, None
+
+            if postponed_read:
+                # the read has been completed before the lookup - handle it now,
+                # it is dropped if the proper node has newer version of the key
+                self.onread(*postponed_read)
+
+            if newer:
+                log.debug("Key: %r on node: %s/%s is newer. Just removing it from node: %s/%s.",
+                          self.key, self.dest_address, self.dest_backend_id, self.address, self.backend_id)
                 self.attempt = 0
                 self.remove()
                 return
 
-            log.debug("Key: {0} on node: {1}/{2} is older or miss. Reading it from node: {3}/{4}"
-                      .format(repr(self.key), self.dest_address, self.dest_backend_id, self.address, self.backend_id))
+            log.debug("Key: %r on node: %s/%s is older or miss. Reading it from node: %s/%s",
+                      self.key, self.dest_address, self.dest_backend_id, self.address, self.backend_id)
             if self.ctx.dry_run:
                 log.debug("Dry-run mode is turned on. Skipping reading, writing and removing stages.")
-                return
-            self.attempt = 0
-            self.read()
+                self.stop(True)
         except Exception as e:
             log.error("Onlookup exception: {0}, traceback: {1}"
                       .format(repr(e), traceback.format_exc()))
             self.stop(False)
+        finally:
+            self.finish_op()
 
     def onread(self, results, error):
+        with self.lock:
+            if self.lookup_pending and not self.stopped:
+                # the lookup isn't finished yet, so the read will be handled by onlookup
+                self.postponed_read = (results, error)
+                return
         try:
+            with self.lock:
+                if self.drop_read or self.stopped:
+                    return
             if error.code or len(results) < 1:
-                log.debug("Read key: {0} on node: {1}/{2} has been timed out: {3}"
-                          .format(repr(self.key), self.address, self.backend_id, error))
-                if self.attempt < self.ctx.attempts:
-                    old_timeout = self.session.timeout
-                    self.session.timeout *= 2
-                    self.attempt += 1
-                    log.debug("Retry to read key: {0} attempt: {1}/{2} "
-                              "increased timeout: {3}/{4}"
-                              .format(repr(self.key), self.attempt,
-                                      self.ctx.attempts,
-                                      self.direct_session.timeout, old_timeout))
-                    self.read()
+                log.debug("Read key: %r on node: %s/%s has been timed out: %s",
+                          self.key, self.address, self.backend_id, error)
+                if self.read_attempt < self.ctx.attempts:
+                    self.read_attempt += 1
+                    log.debug("Retry to read key: %r attempt: %s/%s increased timeout: %s",
+                              self.key, self.read_attempt, self.ctx.attempts,
+                              attempt_timeout(self.ctx, self.read_attempt))
                     self.stats.read_retries += 1
+                    self.read()
                     return
                 log.error("Reading key: {0} on the node: {1}/{2} failed. "
                           "Skipping it: {3}"
@@ -247,7 +393,7 @@ class Recovery(object):
                 self.stop(False)
                 return
 
-            if self.recovered_size == 0:
+            if self.read_offset == 0:
                 self.session.user_flags = results[0].user_flags
                 self.session.timestamp = results[0].timestamp
                 self.key_flags = results[0].record_flags
@@ -255,34 +401,48 @@ class Recovery(object):
                     self.total_size = results[0].total_size
                     self.chunked = self.total_size > self.ctx.chunk_size
             self.stats.read += 1
-            self.write_data = results[0].data
+            data = results[0].data
             self.total_size = results[0].io_attribute.total_size
             self.stats.read_bytes += results[0].size
-            self.attempt = 0
-            self.write()
+            self.read_offset += len(data)
+            self.read_attempt = 0
+            with self.lock:
+                if self.writing:
+                    # previous chunk is still being written, this one will be written by onwrite
+                    self.read_data = data
+                    return
+                self.writing = True
+            self.write_chunk(data)
         except Exception as e:
             log.error("Onread exception: {0}, traceback: {1}"
                       .format(repr(e), traceback.format_exc()))
             self.stop(False)
+        finally:
+            self.finish_op()
+
+    def write_chunk(self, data):
+        '''
+        Writes chunk and reads the next one meanwhile, so at most 2 chunks are in flight
+        '''
+        self.write_data = data
+        self.attempt = 0
+        if self.read_offset < self.total_size:
+            self.read()
+        self.write()
 
     def onwrite(self, results, error):
         self.write_result = None
         try:
+            with self.lock:
+                if self.stopped:
+                    return
             if error.code or len(results) < 1:
-                log.debug("Write key: {0} on node: {1}/{2} has been timed out: {3}"
-                          .format(repr(self.key),
-                                  self.dest_address,
-                                  self.dest_backend_id,
-                                  error))
+                log.debug("Write key: %r on node: %s/%s has been timed out: %s",
+                          self.key, self.dest_address, self.dest_backend_id, error)
                 if self.attempt < self.ctx.attempts:
-                    old_timeout = self.session.timeout
-                    self.session.timeout *= 2
                     self.attempt += 1
-                    log.debug("Retry to write key: {0} attempt: {1}/{2} "
-                              "increased timeout: {3}/{4}"
-                              .format(repr(self.key),
-                                      self.attempt, self.ctx.attempts,
-                                      self.direct_session.timeout, old_timeout))
+                    log.debug("Retry to write key: %r attempt: %s/%s increased timeout: %s",
+                              self.key, self.attempt, self.ctx.attempts, attempt_timeout(self.ctx, self.attempt))
                     self.stats.write_retries += 1
                     self.write()
                     return
@@ -301,25 +461,42 @@ class Recovery(object):
             self.recovered_size += len(self.write_data)
             self.attempt = 0
 
-            if self.recovered_size < self.total_size:
-                self.read()
+            with self.lock:
+                data, self.read_data = self.read_data, None
+                self.writing = data is not None
+
+            if data is not None:
+                # next chunk has been already read
+                self.write_chunk(data)
+            elif self.recovered_size < self.total_size:
+                # next chunk is still being read and will be written by onread
+                return
             else:
-                log.debug("Key: {0} has been copied to node: {1}/{2}. So we can delete it from node: {3}/{4}"
-                          .format(repr(self.key), self.dest_address, self.dest_backend_id,
-                                  self.address, self.backend_id))
+                log.debug("Key: %r has been copied to node: %s/%s. So we can delete it from node: %s/%s",
+                          self.key, self.dest_address, self.dest_backend_id, self.address, self.backend_id)
                 self.remove()
         except Exception as e:
             log.error("Onwrite exception: {0}, traceback: {1}"
                       .format(repr(e), traceback.format_exc()))
             self.stop(False)
+        finally:
+            self.finish_op()
 
     def onremove(self, removed, stats):
-        self.stats += stats
-        self.stop(removed)
+        try:
+            self.stats += stats
+            self.stop(removed)
+        finally:
+            self.finish_op()
 
     def wait(self):
-        if not self.complete.is_set():
-            self.complete.wait()
+        with self.lock:
+            if self.finished:
+                return
+            if self.complete is None:
+                self.complete = threading.Event()
+            complete = self.complete
+        complete.wait()
 
     def succeeded(self):
         self.wait()
@@ -328,7 +505,7 @@ class Recovery(object):
 
 def iterate_node(ctx, node, address, backend_id, ranges, eid, stats):
     try:
-        log.debug("Running iterator on node: {0}/{1}".format(address, backend_id))
+        log.debug("Running iterator on node: %s/%s", address, backend_id)
         timestamp_range = ctx.timestamp.to_etime(), Time.time_max().to_etime()
         flags = elliptics.iterator_flags.key_range | elliptics.iterator_flags.ts_range
         key_ranges = [IdRange(r[0], r[1]) for r in ranges]
@@ -346,8 +523,7 @@ def iterate_node(ctx, node, address, backend_id, ranges, eid, stats):
                                                          leave_file=False,)
         if result is None:
             return None
-        log.info("Iterator {0}/{1} obtained: {2} record(s)"
-                 .format(result.address, backend_id, result_len))
+        log.info("Iterator %s/%s obtained: %s record(s)", result.address, backend_id, result_len)
         return result
     except Exception as e:
         log.error("Iteration failed for: {0}/{1}: {2}, traceback: {3}"
@@ -363,6 +539,36 @@ class WindowedMerge(WindowedRecovery):
         self.group = group
         self.node = node
         self.results = iter(results)
+        # route table of the group and its sorted ids are built once and used
+        # for determining destination of each key locally via bisect
+        self.routes = get_group_routes(ctx, group)
+        self.route_ids = [r.id for r in self.routes]
+        # all keys are read from the same address/backend and written to the same group,
+        # so sessions of finished recovers can be reused by next ones without reconfiguration
+        self.free_sessions = []
+
+    def get_sessions(self):
+        '''
+        Returns sessions released by one of finished recovers or creates new ones
+        '''
+        try:
+            return self.free_sessions.pop()
+        except IndexError:
+            return create_sessions(self.node, self.address, self.backend_id, self.group, self.ctx)
+
+    def release_sessions(self, sessions):
+        '''
+        Makes sessions available for next recovers. Sessions keep no per-key state:
+        timeouts are set by each request according to its attempt
+        '''
+        self.free_sessions.append(sessions)
+
+    def get_destination(self, key):
+        '''
+        Returns (address, backend_id) of the backend that is responsible for the key
+        '''
+        route = self.routes[bisect(self.route_ids, key) - 1]
+        return route.address, route.backend_id
 
     def run_one(self):
         try:
@@ -370,6 +576,13 @@ class WindowedMerge(WindowedRecovery):
             with self.lock:
                 response = next(self.results)
                 self.recovers_in_progress += 1
+            dest_address, dest_backend_id = self.get_destination(response.key)
+            sessions = self.get_sessions()
+
+            def callback(result, stat):
+                self.release_sessions(sessions)
+                self.callback(result, stat)
+
             Recovery(key=response.key,
                      timestamp=response.timestamp,
                      size=response.size,
@@ -379,7 +592,11 @@ class WindowedMerge(WindowedRecovery):
                      group=self.group,
                      ctx=self.ctx,
                      node=self.node,
-                     callback=self.callback).run()
+                     callback=callback,
+                     dest_address=dest_address,
+                     dest_backend_id=dest_backend_id,
+                     stats=self.get_stat(),
+                     sessions=sessions).run()
             return True
         except StopIteration:
             pass
@@ -403,18 +620,12 @@ def recover(ctx, address, backend_id, group, node, results, stats):
     return ret
 
 
-def process_node_backend(ctx, address, backend_id, group, ranges):
-    log.debug("Processing node: {0}/{1} from group: {2} for ranges: {3}"
-              .format(address, backend_id, group, ranges))
+def process_node_backend((ctx, address, backend_id, group, ranges)):
+    log.debug("Processing node: %s/%s from group: %s for ranges: %s", address, backend_id, group, ranges)
     stats = ctx.stats['node_{0}/{1}'.format(address, backend_id)]
     stats.timer('process', 'started')
 
-    elog = elliptics.Logger(ctx.log_file, int(ctx.log_level))
-    node = elliptics_create_node(address=ctx.address,
-                                 elog=elog,
-                                 wait_timeout=ctx.wait_timeout,
-                                 remotes=ctx.remotes,
-                                 io_thread_num=4)
+    node = get_worker_node()
 
     stats.timer('process', 'iterate')
     results = iterate_node(ctx=ctx,
@@ -428,12 +639,17 @@ def process_node_backend(ctx, address, backend_id, group, ranges):
         log.warning('Iterator result is empty, skipping')
         return True
 
-    stats.timer('process', 'dump_keys')
-    dump_path = os.path.join(ctx.tmp_dir, 'dump_{0}.{1}'.format(address, backend_id))
-    log.debug("Dump iterated keys to file: {0}".format(dump_path))
-    with open(dump_path, 'w') as dump_f:
-        for r in results:
-            dump_f.write('{0}\n'.format(r.key))
+    # orders keys by id, so consecutive keys fall into the same route range and are recovered
+    # to the same destination backend
+    stats.timer('process', 'sort')
+    results.sort()
+
+    if ctx.dump_keys:
+        stats.timer('process', 'dump_keys')
+        dump_path = os.path.join(ctx.tmp_dir, 'dump_{0}.{1}'.format(address, backend_id))
+        log.debug("Dump iterated keys to file: %s", dump_path)
+        with open(dump_path, 'w') as dump_f:
+            dump_f.writelines('{0}\n'.format(r.key) for r in results)
 
     stats.timer('process', 'recover')
     ret = recover(ctx, address, backend_id, group, node, results, stats)
@@ -444,7 +660,7 @@ def process_node_backend(ctx, address, backend_id, group, ranges):
 
 def get_ranges(ctx, group):
     ranges = dict()
-    routes = RouteList(ctx.routes.filter_by_group(group))
+    routes = get_group_routes(ctx, group)
 
     ID_MIN = elliptics.Id([0] * 64, group)
     ID_MAX = elliptics.Id([255] * 64, group)
@@ -466,10 +682,23 @@ def get_ranges(ctx, group):
     else:
         addresses = routes.addresses_with_backends()
 
+    # collects ranges of all backends by one pass over sorted routes of the group
+    # instead of scanning whole route list for each backend
+    backends_ranges = defaultdict(list)
+    owner, start = None, None
+    for route in routes:
+        addr_info = (route.address, route.backend_id)
+        if addr_info != owner:
+            if owner is not None:
+                backends_ranges[owner].append((start, route.id))
+            owner, start = addr_info, route.id
+    if owner is not None:
+        backends_ranges[owner].append((start, ID_MAX))
+
     for addr, backend_id in addresses:
         addr_info = (addr, backend_id)
-        addr_ranges = routes.get_address_backend_ranges(addr, backend_id)
-        if addr_ranges is None or len(addr_ranges) == 0:
+        addr_ranges = backends_ranges.get(addr_info)
+        if not addr_ranges:
             log.warning("Address: {0}/{1} has no range in group: {2}".format(addr, backend_id, group))
             continue
 
@@ -477,8 +706,7 @@ def get_ranges(ctx, group):
         if addr_ranges[0][0] != ID_MIN:
             ranges[addr_info].append((ID_MIN, addr_ranges[0][0]))
 
-        for i in xrange(1, len(addr_ranges)):
-            ranges[addr_info].append((addr_ranges[i - 1][1], addr_ranges[i][0]))
+        ranges[addr_info].extend((prev[1], cur[0]) for prev, cur in zip(addr_ranges, addr_ranges[1:]))
 
         if addr_ranges[-1][1] != ID_MAX:
             ranges[addr_info].append((addr_ranges[-1][1], ID_MAX))
@@ -500,7 +728,7 @@ def main(ctx):
         group_stats = ctx.stats['group_{0}'.format(group)]
         group_stats.timer('group', 'started')
 
-        group_routes = ctx.routes.filter_by_groups([group])
+        group_routes = get_group_routes(ctx, group)
         if len(group_routes.addresses_with_backends()) < 2:
             log.warning("Group {0} hasn't enough nodes/backends for recovery: {1}"
                         .format(group, group_routes.addresses_with_backends()))
@@ -514,23 +742,20 @@ def main(ctx):
             group_stats.timer('group', 'finished')
             continue
 
-        pool_results = []
-
-        log.debug("Processing nodes ranges: {0}".format(ranges))
+        log.debug("Processing nodes ranges: %s", ranges)
 
-        for range in ranges:
-            pool_results.append(ctx.pool.apply_async(process_node_backend, (ctx.portable(),
-                                                                            range[0],
-                                                                            range[1],
-                                                                            group,
-                                                                            ranges[range])))
+        portable_ctx = ctx.portable()
+        # results are fetched in order of completion, so slow nodes don't delay handling of finished ones
+        iresults = ctx.pool.imap_unordered(process_node_backend,
+                                           ((portable_ctx, addr, backend_id, group, ranges[(addr, backend_id)])
+                                            for addr, backend_id in ranges))
 
         try:
             log.info("Fetching results")
             # Use INT_MAX as timeout, so we can catch Ctrl+C
             timeout = 2147483647
-            for p in pool_results:
-                ret &= p.get(timeout)
+            for _ in ranges:
+                ret &= iresults.next(timeout)
         except KeyboardInterrupt:
             log.error("Caught Ctrl+C. Terminating.")
             group_stats.timer('group', 'finished')
@@ -552,19 +777,24 @@ def main(ctx):
 # special recovery class that lookups id on all nodes in group
 # finds out newest version and reads/writes it to node where it should live.
 class DumpRecover(object):
-    def __init__(self, routes, node, id, group, ctx):
+    def __init__(self, node, id, group, ctx, callback, stats=None):
         self.node = node
         self.id = id
-        self.routes = routes.filter_by_group(group)
+        self.routes = get_group_routes(ctx, group)
         self.group = group
         self.ctx = ctx
         # determines node where the id lives
         self.address, _, self.backend_id = self.routes.get_id_routes(self.id)[0]
         self.lookups_count = 0
         self.recover_address = None
-        self.stats = RecoverStat()
-        self.complete = threading.Event()
+        self.stats = stats if stats is not None else RecoverStat()
+        self.callback = callback
         self.result = True
+        self.stopped = False
+        # number of removes from stale replicas which are in progress
+        self.removes_left = 0
+        # protects state shared by the lookups and the removes which are run in parallel
+        self.lock = threading.Lock()
 
     def run(self):
         self.lookup_results = []
@@ -581,8 +811,7 @@ class DumpRecover(object):
         else:
             addresses_with_backends = self.routes.addresses_with_backends()
         if len(addresses_with_backends) <= 1:
-            log.debug("Key: {0} already on the right node: {1}/{2}. Skip it"
-                      .format(repr(self.id), id_host[0], id_host[1]))
+            log.debug("Key: %r already on the right node: %s/%s. Skip it", self.id, id_host[0], id_host[1])
             self.stats.skipped += 1
             self.stop(True)
             return
@@ -597,36 +826,44 @@ class DumpRecover(object):
                          self.onlookup).run()
 
     def stop(self, result):
+        # the key should be reported to the window only once
+        with self.lock:
+            if self.stopped:
+                return
+            self.stopped = True
         self.result = result
-        log.debug("Finished recovering key: {0} with result: {1}".format(self.id, self.result))
-        self.complete.set()
+        log.debug("Finished recovering key: %s with result: %s", self.id, self.result)
+        self.callback(self.result, self.stats)
 
     def onlookup(self, result, stats):
-        self.stats += stats
-        self.lookup_results.append(result)
-        if len(self.lookup_results) == self.lookups_count:
+        # lookups are completed on different IO threads of the worker node
+        with self.lock:
+            self.stats += stats
+            self.lookup_results.append(result)
+            last = len(self.lookup_results) == self.lookups_count
+        # only the last lookup checks the results
+        if last:
             self.check()
 
     def check(self):
         # finds timestamp of newest object
         self.lookup_results = [r for r in self.lookup_results if r]
         if not self.lookup_results:
-            log.debug("Key: {0} has not been found in group {1}. Skip it".format(self.id, self.group))
+            log.debug("Key: %s has not been found in group %s. Skip it", self.id, self.group)
             self.stats.skipped += 1
             self.stop(True)
             return
         max_ts = max([r.timestamp for r in self.lookup_results])
-        log.debug("Max timestamp of key: {0}: {1}".format(repr(self.id), max_ts))
+        log.debug("Max timestamp of key: %r: %s", self.id, max_ts)
         # filters objects with newest timestamp
         results = [r for r in self.lookup_results if r and r.timestamp == max_ts]
         # finds max size of newest object
         max_size = max([r.total_size for r in results])
-        log.debug("Max size of latest replicas for key: {0}: {1}".format(repr(self.id), max_size))
+        log.debug("Max size of latest replicas for key: %r: %s", self.id, max_size)
         # filters newest objects with max size
         results = [(r.address, r.backend_id, r.record_flags) for r in results if r.total_size == max_size]
         if (self.address, self.backend_id) in results:
-            log.debug("Node: {0} already has the latest version of key: {1}."
-                      .format(self.address, repr(self.id), self.group))
+            log.debug("Node: %s already has the latest version of key: %r.", self.address, self.id)
             # if destination node already has newest object then just remove key from unproper nodes
             self.remove()
         else:
@@ -634,8 +871,8 @@ class DumpRecover(object):
             self.timestamp = max_ts
             self.size = max_size
             self.recover_address, self.recover_backend_id, self.key_flags = results[0]
-            log.debug("Node: {0} has the newer version of key: {1}. Recovering it on node: {2}"
-                      .format(self.recover_address, repr(self.id), self.address))
+            log.debug("Node: %s has the newer version of key: %r. Recovering it on node: %s",
+                      self.recover_address, self.id, self.address)
             self.recover()
 
     def recover(self):
@@ -649,7 +886,9 @@ class DumpRecover(object):
                                        ctx=self.ctx,
                                        node=self.node,
                                        check=False,
-                                       callback=self.onrecover)
+                                       callback=self.onrecover,
+                                       dest_address=self.address,
+                                       dest_backend_id=self.backend_id)
         self.recover_result.run()
 
     def onrecover(self, result, stats):
@@ -663,24 +902,55 @@ class DumpRecover(object):
             return r and r.address not in (self.address, self.recover_address)
         addresses_with_backends = [(r.address, r.backend_id) for r in self.lookup_results if check(r)]
         if addresses_with_backends and not self.ctx.safe:
-            log.debug("Removing key: {0} from nodes: {1}".format(repr(self.id), addresses_with_backends))
+            log.debug("Removing key: %r from nodes: %s", self.id, addresses_with_backends)
+            self.removes_left = len(addresses_with_backends)
             for addr, backend_id in addresses_with_backends:
                 RemoveDirect(addr, backend_id, self.id, self.group,
                              self.ctx, self.node, self.onremove).run()
         else:
             self.stop(True)
 
-    def wait(self):
-        if not self.complete.is_set():
-            self.complete.wait()
-
     def onremove(self, removed, stats):
-        self.stats += stats
-        self.stop(self.result & removed)
+        with self.lock:
+            self.stats += stats
+            self.result &= removed
+            self.removes_left -= 1
+            last = self.removes_left == 0
+        # the key is finished when all stale replicas are removed
+        if last:
+            self.stop(self.result)
 
-    def succeeded(self):
-        self.wait()
-        return self.result
+
+class WindowedDump(WindowedRecovery):
+    '''
+    Recovers keys from the dump file by DumpRecover in sliding window of ctx.max_inflight keys
+    '''
+    def __init__(self, ctx, node, group, keys, stats):
+        super(WindowedDump, self).__init__(ctx, stats)
+        self.node = node
+        self.group = group
+        self.keys = iter(keys)
+
+    def run_one(self):
+        try:
+            key = None
+            with self.lock:
+                key = next(self.keys)
+                self.recovers_in_progress += 1
+            DumpRecover(node=self.node,
+                        id=key,
+                        group=self.group,
+                        ctx=self.ctx,
+                        callback=self.callback,
+                        stats=self.get_stat()).run()
+            return True
+        except StopIteration:
+            last = False
+            with self.lock:
+                last = self.recovers_in_progress == 0
+            if last:
+                self.complete.set()
+        return False
 
 
 class ServerSendRecovery(object):
@@ -707,7 +977,7 @@ class ServerSendRecovery(object):
             ranges = sorted(ranges, key=lambda r: r[0])
             return reduce(lambda x, y: x + y, ranges, tuple())
 
-        group_routes = ctx.routes.filter_by_groups([group])
+        group_routes = get_group_routes(ctx, group)
         routes = []
         if ctx.one_node:
             if ctx.backend_id is not None:
@@ -722,7 +992,7 @@ class ServerSendRecovery(object):
                 ranges = group_routes.get_address_backend_ranges(addr, backend_id)
                 routes.append((addr, backend_id, sort_ranges(ranges)))
 
-        log.info("Server-send recovery: group: {0}, num addresses: {1}".format(group, len(routes)))
+        log.info("Server-send recovery: group: %s, num addresses: %s", group, len(routes))
         return routes
 
     def recover(self, keys):
@@ -731,7 +1001,7 @@ class ServerSendRecovery(object):
         removes keys with older timestamp or invalid checksum.
         Returns list of keys that was not recovered via server-send.
         '''
-        log.info("Server-send bucket: num keys: {0}".format(len(keys)))
+        log.info("Server-send bucket: num keys: %s", len(keys))
 
         def contain(key, ranges):
             index = bisect(ranges, key)
@@ -750,7 +1020,7 @@ class ServerSendRecovery(object):
         '''
         Calls server-send with a given list of keys to the specific backend.
         '''
-        log.debug("Server-send: address: {0}, backend: {1}, num keys: {2}".format(addr, backend_id, len(keys)))
+        log.debug("Server-send: address: %s, backend: %s, num keys: %s", addr, backend_id, len(keys))
 
         self.session.set_direct_id(addr, backend_id)
         iterator = self.session.server_send(keys, elliptics.iterator_flags.move, list(self.session.groups))
@@ -758,7 +1028,7 @@ class ServerSendRecovery(object):
             status = result.response.status
             key = result.response.key
             r = (key, status, addr, backend_id)
-            log.debug("Server-send result: key: {0}, status: {1}".format(str(key), status))
+            log.debug("Server-send result: key: %s, status: %s", key, status)
             responses[str(key)].append(r)
 
     def _remove_bad_keys(self, responses):
@@ -778,7 +1048,7 @@ class ServerSendRecovery(object):
 
         for i, r in enumerate(results):
             status = r.get()[0].status
-            log.info("Removing key: {0}, status: ".format(bad_keys[i], status))
+            log.info("Removing key: %s, status: %s", bad_keys[i], status)
 
     def _check_bad_key(self, response):
         status = response[1]
@@ -808,37 +1078,23 @@ class ServerSendRecovery(object):
 
 
 def dump_process_group((ctx, group)):
-    log.debug("Processing group: {0}".format(group))
+    log.debug("Processing group: %s", group)
     stats = ctx.stats['group_{0}'.format(group)]
     stats.timer('process', 'started')
     if group not in ctx.routes.groups():
         log.error("Group: {0} is not presented in route list".format(group))
         return False
-    elog = elliptics.Logger(ctx.log_file, int(ctx.log_level))
-    node = elliptics_create_node(address=ctx.address,
-                                 elog=elog,
-                                 wait_timeout=ctx.wait_timeout,
-                                 net_thread_num=1,
-                                 io_thread_num=1,
-                                 remotes=ctx.remotes)
+    node = get_worker_node()
     ret = True
     with open(ctx.dump_file, 'r') as dump:
         ss_rec = ServerSendRecovery(ctx, node, group)
         # splits ids from dump file in batchs and recovers it
-        for batch_id, batch in groupby(enumerate(dump), key=lambda x: x[0] / ctx.batch_size):
-            recovers = []
-            rs = RecoverStat()
-            keys = [elliptics.Id(val) for _, val in batch]
+        for batch in chunks(dump, ctx.batch_size):
+            keys = [elliptics.Id(val) for val in batch]
             keys = ss_rec.recover(keys)
-            for k in keys:
-                rec = DumpRecover(routes=ctx.routes, node=node, id=k, group=group, ctx=ctx)
-                recovers.append(rec)
-                rec.run()
-            for r in recovers:
-                r.wait()
-                ret &= r.succeeded()
-                rs += r.stats
-            rs.apply(stats)
+            # keys which haven't been recovered via server-send are recovered one by one
+            if keys:
+                ret &= WindowedDump(ctx=ctx, node=node, group=group, keys=keys, stats=stats).run()
     stats.timer('process', 'finished')
     return ret
 
@@ -24,6 +24,7 @@ import traceback
 import struct
 import elliptics
 import time
+from itertools import islice
 
 
 def logged_class(klass):
@@ -39,6 +40,18 @@ def id_to_int(key_id):
     return int(''.join('%02x' % b for b in key_id.id[:64]), 16)
 
 
+def chunks(iterable, size):
+    """
+    Splits @iterable into lists of @size items, the last one may be shorter
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def mk_container_name(address, backend_id, prefix="iterator_"):
     """
     Makes filename for iterators' results
@@ -60,7 +73,7 @@ def elliptics_create_node(address=None, elog=None, wait_timeout=3600, check_time
     """
     Connects to elliptics cloud
     """
-    log.debug("Creating node using: {0}, wait_timeout: {1}, remotes: {2}".format(address, wait_timeout, remotes))
+    log.debug("Creating node using: %s, wait_timeout: %s, remotes: %s", address, wait_timeout, remotes)
     cfg = elliptics.Config()
     cfg.config.wait_timeout = wait_timeout
     cfg.config.check_timeout = check_timeout
@@ -70,12 +83,12 @@ def elliptics_create_node(address=None, elog=None, wait_timeout=3600, check_time
     cfg.config.net_thread_num = net_thread_num
     node = elliptics.Node(elog, cfg)
     node.add_remotes([address] + remotes)
-    log.debug("Created node: {0}".format(node))
+    log.debug("Created node: %s", node)
     return node
 
 
 def elliptics_create_session(node=None, group=None, cflags=elliptics.command_flags.default, trace_id=0):
-    log.debug("Creating session: {0}@{1}.{2}".format(node, group, cflags))
+    log.debug("Creating session: %s@%s.%s", node, group, cflags)
     session = elliptics.Session(node)
     session.groups = [group]
     session.cflags = cflags
@@ -83,10 +96,32 @@ def elliptics_create_session(node=None, group=None, cflags=elliptics.command_fla
     return session
 
 
-def worker_init():
-    """Do not catch Ctrl+C in worker"""
+# recovery context and elliptics node of the pool's worker process
+g_ctx = None
+g_node = None
+
+
+def worker_init(ctx=None):
+    """Do not catch Ctrl+C in worker and keep recovery context for the worker's node"""
     from signal import signal, SIGINT, SIG_IGN
     signal(SIGINT, SIG_IGN)
+    global g_ctx
+    g_ctx = ctx
+
+
+def get_worker_node():
+    """
+    Returns elliptics node of the worker process.
+    The node is created by the first call and reused by all following tasks of the worker.
+    """
+    global g_node
+    if g_node is None:
+        g_node = elliptics_create_node(address=g_ctx.address,
+                                       elog=elliptics.Logger(g_ctx.log_file, int(g_ctx.log_level)),
+                                       wait_timeout=g_ctx.wait_timeout,
+                                       remotes=g_ctx.remotes,
+                                       io_thread_num=4)
+    return g_node
 
 
 # common class for collecting statistics of recovering one key
@@ -160,6 +195,30 @@ class RecoverStat(object):
 
         self.reset()
 
+    def __iadd__(self, b):
+        # accumulates in place so `stats += other` doesn't allocate new object
+        self.skipped += b.skipped
+        self.lookup += b.lookup
+        self.lookup_failed += b.lookup_failed
+        self.lookup_retries += b.lookup_retries
+        self.read += b.read
+        self.read_failed += b.read_failed
+        self.read_retries += b.read_retries
+        self.read_bytes += b.read_bytes
+        self.write += b.write
+        self.write_failed += b.write_failed
+        self.write_retries += b.write_retries
+        self.written_bytes += b.written_bytes
+        self.remove += b.remove
+        self.remove_failed += b.remove_failed
+        self.remove_retries += b.remove_retries
+        self.removed_bytes += b.removed_bytes
+        self.remove_old += b.remove_old
+        self.remove_old_failed += b.remove_old_failed
+        self.remove_old_bytes += b.remove_old_bytes
+        self.merged_indexes += b.merged_indexes
+        return self
+
     def __add__(self, b):
         ret = RecoverStat()
         ret.skipped = self.skipped + b.skipped
@@ -185,20 +244,38 @@ class RecoverStat(object):
         return ret
 
 
+def attempt_timeout(ctx, attempt):
+    '''
+    Returns timeout of @attempt of operation: ctx.wait_timeout doubled on each retry
+    '''
+    return ctx.wait_timeout << attempt
+
+
+def create_direct_session(node, group, ctx):
+    '''
+    Creates session for direct operations in @group.
+    It can be passed to DirectOperation for avoiding creation of new session per operation
+    '''
+    session = elliptics.Session(node)
+    # turns off exceptions
+    session.exceptions_policy = elliptics.core.exceptions_policy.no_exceptions
+    session.trace_id = ctx.trace_id
+    # sets groups
+    session.groups = [group]
+    return session
+
+
 class DirectOperation(object):
     '''
     Base class for direct operations with id from address in group
     '''
-    def __init__(self, address, backend_id, id, group, ctx, node, callback):
-        # creates new session
-        self.session = elliptics.Session(node)
-        # turns off exceptions
-        self.session.exceptions_policy = elliptics.core.exceptions_policy.no_exceptions
+    def __init__(self, address, backend_id, id, group, ctx, node, callback, session=None):
+        if session is None:
+            # creates new session
+            session = create_direct_session(node, group, ctx)
         # makes session direct to the address
-        self.session.set_direct_id(address, backend_id)
-        self.session.trace_id = ctx.trace_id
-        # sets groups
-        self.session.groups = [group]
+        session.set_direct_id(address, backend_id)
+        self.session = session
         self.id = id
         self.stats = RecoverStat()
         self.attempt = 0
@@ -211,6 +288,7 @@ class DirectOperation(object):
 # class for looking up id directly from address via reading 1 byte of it
 class LookupDirect(DirectOperation):
     def run(self):
+        self.session.timeout = attempt_timeout(self.ctx, self.attempt)
         # read one byt of id
         async_result = self.session.read_data(self.id, offset=0, size=1)
         async_result.connect(self.onread)
@@ -218,19 +296,15 @@ class LookupDirect(DirectOperation):
     def onread(self, results, error):
         try:
             if error.code == -errno.ETIMEDOUT:
-                log.debug("Lookup key: {0} has been timed out: {1}"
-                          .format(repr(self.id), error))
+                log.debug("Lookup key: %r has been timed out: %s", self.id, error)
                 # if read failed with timeout - retry it predetermined number of times
                 if self.attempt < self.ctx.attempts:
-                    old_timeout = self.session.timeout
-                    self.session.timeout *= 2
                     self.attempt += 1
-                    log.debug("Retry to lookup key: {0} attempt: {1}/{2} increased timeout: {3}/{4}"
-                              .format(repr(self.id),
-                                      self.attempt, self.ctx.attempts,
-                                      self.session.timeout, old_timeout))
+                    log.debug("Retry to lookup key: %r attempt: %s/%s increased timeout: %s",
+                              self.id, self.attempt, self.ctx.attempts, attempt_timeout(self.ctx, self.attempt))
                     self.stats.lookup_retries += 1
                     self.run()
+                    return
 
             if error.code:
                 self.stats.lookup_failed += 1
@@ -249,24 +323,20 @@ class RemoveDirect(DirectOperation):
     Class for removing id directly from address
     '''
     def run(self):
+        self.session.timeout = attempt_timeout(self.ctx, self.attempt)
         async_result = self.session.remove(self.id)
         async_result.connect(self.onremove)
 
     def onremove(self, results, error):
         try:
             if error.code:
-                log.debug("Remove key: {0} on node: {1}/{2} has been failed: {3}"
-                          .format(self.id, self.address, self.backend_id, repr(error)))
+                log.debug("Remove key: %s on node: %s/%s has been failed: %r",
+                          self.id, self.address, self.backend_id, error)
                 # if removing filed - retry it predetermined number of times
                 if self.attempt < self.ctx.attempts:
-                    old_timeout = self.session.timeout
-                    self.session.timeout *= 2
                     self.attempt += 1
-                    log.debug("Retry to remove key: {0} attempt: {1}/{2} "
-                              "increased timeout: {3}/{4}"
-                              .format(repr(self.id),
-                                      self.attempt, self.ctx.attempts,
-                                      self.session.timeout, old_timeout))
+                    log.debug("Retry to remove key: %r attempt: %s/%s increased timeout: %s",
+                              self.id, self.attempt, self.ctx.attempts, attempt_timeout(self.ctx, self.attempt))
                     self.stats.remove_retries += 1
                     self.run()
                     return
@@ -343,11 +413,16 @@ class WindowedRecovery(object):
         self.result = True
         self.recovers_in_progress = 0
         self.processed_keys = 0
+        # RecoverStat objects of finished recovers which can be reused by next ones
+        self.free_stats = []
+        # per-thread state of run_next()
+        self.local = threading.local()
 
     def run(self):
         self.start_time = time.time()
 
-        for i in xrange(self.ctx.batch_size):
+        # starts up to max_inflight recovers, each finished recover starts the next one from callback
+        for i in xrange(self.ctx.max_inflight):
             if not self.run_one():
                 break
 
@@ -359,8 +434,33 @@ class WindowedRecovery(object):
         self.stats.set_counter('recovers_in_progress', self.recovers_in_progress)
         return self.result
 
+    def get_stat(self):
+        """Returns RecoverStat released by one of finished recovers or new one"""
+        try:
+            return self.free_stats.pop()
+        except IndexError:
+            return RecoverStat()
+
+    def run_next(self):
+        """
+        Starts next recover. Recovers finished synchronously inside run_one() don't start
+        next ones recursively: they are started by the loop of the outer call in this thread
+        """
+        local = self.local
+        if getattr(local, 'running', False):
+            local.pending += 1
+            return
+        local.running = True
+        local.pending = 1
+        try:
+            while local.pending:
+                local.pending -= 1
+                self.run_one()
+        finally:
+            local.running = False
+
     def callback(self, result, stat):
-        self.run_one()
+        self.run_next()
         last = False
         with self.lock:
             self.result &= result
@@ -368,7 +468,9 @@ class WindowedRecovery(object):
             self.recovers_in_progress -= 1
             last = self.recovers_in_progress == 0
 
+        # apply() resets stat so it can be returned to the pool right after
         stat.apply(self.stats)
+        self.free_stats.append(stat)
         speed = self.processed_keys / (time.time() - self.start_time)
         self.stats.set_counter('recovery_speed', round(speed, 2))
         self.stats.set_counter('recovers_in_progress', self.recovers_in_progress)
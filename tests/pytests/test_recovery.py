@@ -103,21 +103,26 @@ def write_data(scope, session, keys, datas):
         r.wait()
 
 
-def check_keys_absence(scope, session, keys):
+def check_keys_absence(scope, session, keys, addresses_with_backends=None):
     '''
-    Checks that merge recovery removes moved @keys from the source backend.
+    Checks that merge recovery removes moved @keys from the source backend
+    or from all @addresses_with_backends if they are specified.
     '''
+    if addresses_with_backends is None:
+        addresses_with_backends = ((scope.test_address, scope.test_backend),)
     session = session.clone()
     session.exceptions_policy = elliptics.core.exceptions_policy.no_exceptions
     session.set_filter(elliptics.filters.all)
-    session.set_direct_id(scope.test_address, scope.test_backend)
 
     routes = session.routes.filter_by_group(scope.test_group)
     results = []
-    for k in keys:
-        addr, _, backend = routes.get_id_routes(session.transform(k))[0]
-        if addr != scope.test_address or backend != scope.test_backend:
-            results.append(session.lookup(k))
+    for address, backend_id in addresses_with_backends:
+        direct_session = session.clone()
+        direct_session.set_direct_id(address, backend_id)
+        for k in keys:
+            addr, _, backend = routes.get_id_routes(session.transform(k))[0]
+            if addr != address or backend != backend_id:
+                results.append(direct_session.lookup(k))
 
     assert len(results) > 0
     for r in results:
@@ -139,7 +144,7 @@ def check_data(scope, session, keys, datas, timestamp):
 
 
 def recovery(one_node, remotes, backend_id, address, groups,
-             rtype, log_file, tmp_dir, dump_file=None, no_meta=False, user_flags_set=()):
+             rtype, log_file, tmp_dir, dump_file=None, no_meta=False, user_flags_set=(), chunk_size=1024):
     '''
     Imports dnet_recovery tools and executes merge recovery. Checks result of merge.
     '''
@@ -155,7 +160,7 @@ def recovery(one_node, remotes, backend_id, address, groups,
 
     args = ['-D', tmp_dir,
             '-l', os.path.join(tmp_dir, 'recovery.log'),
-            '-c', 1024,
+            '-c', chunk_size,
             '-L', elliptics.log_level.debug,
             '-g', ','.join(map(str, groups)),
             '-b', 100,
@@ -377,7 +382,9 @@ class TestRecovery:
 
         session.groups = (scope.test_group,)
         check_data(scope, session, self.keys, self.datas, self.timestamp)
-        check_keys_absence(scope, session, self.keys)
+        # checks that keys were removed from all backends which are not proper for them
+        check_keys_absence(scope, session, self.keys,
+                           session.routes.filter_by_group(scope.test_group).addresses_with_backends())
 
     def test_enable_all_group_backends(self, server, simple_node):
         '''
@@ -915,6 +922,29 @@ class TestMerge:
         enable_backends(scope.session, scope.routes.addresses_with_backends())
 
 
+@pytest.mark.incremental
+class TestMergeChunked(TestMerge):
+    '''
+        Description:
+            the same as TestMerge, but merge recovers keys by chunks which are smaller than keys,
+            so reading and writing of the keys are done in several steps
+    '''
+    def test_recovery(self, server, simple_node):
+        '''
+        Runs recovery with small chunk size and checks recovery result
+        '''
+        recovery(one_node=False,
+                 remotes=map(elliptics.Address.from_host_port_family, server.remotes),
+                 backend_id=None,
+                 address=scope.address,
+                 groups=(scope.group,),
+                 rtype=RECOVERY.MERGE,
+                 no_meta=False,
+                 log_file='merge_chunked.log',
+                 tmp_dir='merge_chunked',
+                 chunk_size=100)
+
+
 @pytest.mark.incremental
 class TestDC:
     '''